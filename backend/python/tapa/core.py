@@ -165,9 +165,12 @@ class Program:
     _logger.info('extracting HLS C++ files')
     check_mmap_arg_name(self._tasks.values())
 
+    cpp_paths = []
     for task in self._tasks.values():
-      with open(self.get_cpp(task.name), 'w') as src_code:
-        src_code.write(util.clang_format(task.code))
+      cpp_paths.append(self.get_cpp(task.name))
+      with open(cpp_paths[-1], 'w') as src_code:
+        src_code.write(task.code)
+    util.clang_format_parallel(cpp_paths)
     for name, content in self.headers.items():
       header_path = os.path.join(self.cpp_dir, name)
       os.makedirs(os.path.dirname(header_path), exist_ok=True)
@@ -1,4 +1,5 @@
 import enum
+import sys
 from typing import Iterator, Tuple, Union
 
 from tapa import util
@@ -27,9 +28,27 @@ class Instance:
 
   """
 
+  __slots__ = (
+      'task',
+      'instance_id',
+      'step',
+      'args',
+      '_name',
+      '_state',
+      '_rst_n',
+      '_start',
+      '_done',
+      '_is_done',
+      '_idle',
+      '_ready',
+      '_signals',
+      '_arg_prefix',
+  )
+
   class Arg:
+    __slots__ = ('name', 'instance', 'cat', 'port', 'width', 'shared')
 
-    class Cat(enum.Enum):
+    class Cat(enum.IntFlag):
       INPUT = 1 << 0
       OUTPUT = 1 << 1
       SCALAR = 1 << 2
@@ -49,13 +68,7 @@ class Instance:
       self.name = name
       self.instance = instance
       if isinstance(cat, str):
-        self.cat = {
-            'istream': Instance.Arg.Cat.ISTREAM,
-            'ostream': Instance.Arg.Cat.OSTREAM,
-            'scalar': Instance.Arg.Cat.SCALAR,
-            'mmap': Instance.Arg.Cat.MMAP,
-            'async_mmap': Instance.Arg.Cat.ASYNC_MMAP
-        }[cat]
+        self.cat = _CAT_BY_NAME[cat]
         # only lower-level async_mmap is acknowledged
         if is_upper and self.cat == Instance.Arg.Cat.ASYNC_MMAP:
           self.cat = Instance.Arg.Cat.MMAP
@@ -81,6 +94,21 @@ class Instance:
     self.task = task
     self.instance_id = instance_id
     self.step = kwargs.pop('step')
+    # names and signals are used many times during codegen; build them once
+    self._name = util.get_instance_name((task.name, instance_id))
+    self._state = _identifier(f'{self._name}__state')
+    self._rst_n = _identifier(f'{self._name}__{rtl.HANDSHAKE_RST_N}')
+    self._start = _identifier(f'{self._name}__{rtl.HANDSHAKE_START}')
+    self._done = _identifier(f'{self._name}__{rtl.HANDSHAKE_DONE}')
+    self._is_done = _identifier(f'{self._name}__is_done')
+    self._idle = _identifier(f'{self._name}__{rtl.HANDSHAKE_IDLE}')
+    self._ready = _identifier(f'{self._name}__{rtl.HANDSHAKE_READY}')
+    self._signals = {
+        'done': self._done,
+        'idle': self._idle,
+        'ready': self._ready,
+    }
+    self._arg_prefix = f'{self._name}___'
     self.args: Tuple[Instance.Arg, ...] = tuple(
         sorted(
             Instance.Arg(
@@ -93,7 +121,7 @@ class Instance:
 
   @property
   def name(self) -> str:
-    return util.get_instance_name((self.task.name, self.instance_id))
+    return self._name
 
   @property
   def is_autorun(self) -> bool:
@@ -181,7 +209,7 @@ class Instance:
   @property
   def state(self) -> ast.Identifier:
     """State of this instance."""
-    return ast.Identifier(f'{self.name}__state')
+    return self._state
 
   def set_state(self, new_state: ast.Node) -> ast.NonblockingSubstitution:
     return ast.NonblockingSubstitution(left=self.state, right=new_state)
@@ -192,7 +220,7 @@ class Instance:
   @property
   def rst_n(self) -> ast.Identifier:
     """The handshake synchronous active-low reset signal."""
-    return ast.Identifier(f'{self.name}__{rtl.HANDSHAKE_RST_N}')
+    return self._rst_n
 
   @property
   def start(self) -> ast.Identifier:
@@ -204,7 +232,7 @@ class Instance:
     Returns:
       The ast.Identifier node of this signal.
     """
-    return ast.Identifier(f'{self.name}__{rtl.HANDSHAKE_START}')
+    return self._start
 
   @property
   def done(self) -> ast.Identifier:
@@ -215,28 +243,28 @@ class Instance:
     Returns:
       The ast.Identifier node of this signal.
     """
-    return ast.Identifier(f'{self.name}__{rtl.HANDSHAKE_DONE}')
+    return self._done
 
   @property
   def is_done(self) -> ast.Identifier:
     """Signal used to determine the upper-level state."""
-    return ast.Identifier(f'{self.name}__is_done')
+    return self._is_done
 
   @property
   def idle(self) -> ast.Identifier:
     """Whether this isntance is idle."""
-    return ast.Identifier(f'{self.name}__{rtl.HANDSHAKE_IDLE}')
+    return self._idle
 
   @property
   def ready(self) -> ast.Identifier:
     """Whether this isntance is ready to take new input."""
-    return ast.Identifier(f'{self.name}__{rtl.HANDSHAKE_READY}')
+    return self._ready
 
   def get_signal(self, signal: str) -> ast.Identifier:
-    if signal not in {'done', 'idle', 'ready'}:
+    if signal not in self._signals:
       raise ValueError(
           'signal should be one of (done, idle, ready), got {}'.format(signal))
-    return getattr(self, signal)
+    return self._signals[signal]
 
   @property
   def handshake_signals(self) -> Iterator[Union[ast.Wire, ast.Reg]]:
@@ -250,26 +278,35 @@ class Instance:
     else:
       yield ast.Wire(name=self.start.name, width=None)
       yield ast.Reg(name=self.state.name, width=ast.make_width(2))
-      yield from (ast.Wire(name=rtl.wire_name(self.name, suffix), width=None)
+      yield from (ast.Wire(name=f'{self._name}__{suffix}', width=None)
                   for suffix in rtl.HANDSHAKE_OUTPUT_PORTS)
 
   def get_instance_arg(self, arg: str) -> str:
     if "'d" in arg:
       width, value = arg.split("'d")
-      return f'{self.name}___const__{width}b{value}'
-    return f'{self.name}___{arg}'
+      return sys.intern(f'{self._arg_prefix}const__{width}b{value}')
+    return sys.intern(self._arg_prefix + arg)
+
+
+def _identifier(name: str) -> ast.Identifier:
+  """Returns an ast.Identifier with an interned name."""
+  return ast.Identifier(sys.intern(name))
+
+
+_CAT_BY_NAME = {
+    'istream': Instance.Arg.Cat.ISTREAM,
+    'ostream': Instance.Arg.Cat.OSTREAM,
+    'scalar': Instance.Arg.Cat.SCALAR,
+    'mmap': Instance.Arg.Cat.MMAP,
+    'async_mmap': Instance.Arg.Cat.ASYNC_MMAP,
+}
 
 
 class Port:
+  __slots__ = ('cat', 'name', 'ctype', 'width')
 
   def __init__(self, obj):
-    self.cat = {
-        'istream': Instance.Arg.Cat.ISTREAM,
-        'ostream': Instance.Arg.Cat.OSTREAM,
-        'scalar': Instance.Arg.Cat.SCALAR,
-        'mmap': Instance.Arg.Cat.MMAP,
-        'async_mmap': Instance.Arg.Cat.ASYNC_MMAP,
-    }[obj['cat']]
+    self.cat = _CAT_BY_NAME[obj['cat']]
     self.name = rtl.sanitize_array_name(obj['name'])
     self.ctype = obj['type']
     self.width = obj['width']
@@ -97,7 +97,7 @@ class Task:
     for instance in instances:
       for arg in instance.args:
         self._args[arg.name].append(arg)
-        if arg.cat in {Instance.Arg.Cat.MMAP, Instance.Arg.Cat.ASYNC_MMAP}:
+        if arg.cat & Instance.Arg.Cat.MMAP:  # MMAP or ASYNC_MMAP
           mmaps[arg.name].append(arg)
 
     self._mmaps = {}
@@ -1,5 +1,5 @@
 import logging
-from typing import Callable, Dict, Tuple, TextIO
+from typing import Callable, Dict, Mapping, Tuple, TextIO
 
 from tapa import util
 from tapa.verilog import xilinx as rtl
@@ -211,7 +211,7 @@ def get_port_vertices(
   return type_marked(port_vertices, 'PORT_VERTEX')
 
 
-def get_vertices(top_task: Task, arg_name_to_external_port: Dict[str, str]):
+def get_vertices(top_task: Task, arg_name_to_external_port: Mapping[str, str]):
   all_vertices = {}
   all_vertices.update(get_task_vertices(top_task))
   all_vertices.update(get_ctrl_vertices(top_task))
@@ -1,9 +1,17 @@
-import configparser
+import functools
+import hashlib
 import logging
+import os
 import os.path
+import re
 import shutil
 import subprocess
-from typing import Dict, Iterator, TextIO, Tuple
+import sys
+import types
+import weakref
+from concurrent import futures
+from typing import (BinaryIO, Dict, Iterable, Iterator, Mapping, Optional, Set,
+                    TextIO, Tuple, Union)
 
 from .task import Task
 from .instance import Instance
@@ -11,35 +19,104 @@ from .instance import Instance
 _logger = logging.getLogger().getChild(__name__)
 
 
-def clang_format(code: str, *args: str) -> str:
-  """Apply clang-format with given arguments, if possible."""
+@functools.lru_cache(maxsize=1)
+def _find_clang_format() -> Optional[str]:
+  """Returns the path to clang-format, or None if not found on PATH."""
   for version in range(10, 4, -1):
     clang_format_exe = shutil.which('clang-format-%d' % version)
     if clang_format_exe is not None:
-      break
-  else:
-    clang_format_exe = shutil.which('clang-format')
+      return clang_format_exe
+  return shutil.which('clang-format')
+
+
+def clang_format(code: str, *args: str) -> str:
+  """Apply clang-format with given arguments, if possible."""
+  clang_format_exe = _find_clang_format()
   if clang_format_exe is not None:
+    # an absolute executable path and `close_fds=False` allow CPython (>= 3.8)
+    # to spawn via `os.posix_spawn` instead of copying this process via `fork`
     proc = subprocess.run([clang_format_exe, *args],
-                          input=code,
+                          input=code.encode(),
                           stdout=subprocess.PIPE,
                           check=True,
-                          universal_newlines=True)
+                          close_fds=False)
     proc.check_returncode()
-    return proc.stdout
+    return proc.stdout.decode()
   return code
 
 
+def clang_format_many(paths: Iterable[str], *args: str) -> None:
+  """Apply clang-format in place to multiple files, if possible.
+
+  All files are formatted by a single clang-format invocation. As with
+  `clang-format -i`, the style of each file is looked up starting from the
+  directory of that file.
+
+  Args:
+    paths: Iterable of paths to the files to format.
+    args: Additional arguments passed to clang-format.
+  """
+  paths = tuple(paths)
+  clang_format_exe = _find_clang_format()
+  if clang_format_exe is not None and paths:
+    subprocess.run([clang_format_exe, '-i', *args, *paths],
+                   check=True,
+                   close_fds=False)
+
+
+# clang-format runs in subprocesses, so threads are enough for parallelism
+_CLANG_FORMAT_MAX_WORKERS = min((os.cpu_count() or 1) * 2, 16)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_clang_format_executor() -> futures.ThreadPoolExecutor:
+  """Returns the thread pool shared by all clang_format_parallel calls."""
+  return futures.ThreadPoolExecutor(
+      max_workers=_CLANG_FORMAT_MAX_WORKERS,
+      thread_name_prefix='clang-format',
+  )
+
+
+def clang_format_parallel(paths: Iterable[str], *args: str) -> None:
+  """Apply clang-format in place to multiple files in parallel, if possible.
+
+  The files are split into mini-batches, each of which is formatted by a
+  single clang-format invocation via clang_format_many.
+
+  Args:
+    paths: Iterable of paths to the files to format.
+    args: Additional arguments passed to clang-format.
+  """
+  paths = tuple(paths)
+  batch_size = -(-len(paths) // _CLANG_FORMAT_MAX_WORKERS) or 1
+  batches = (paths[i:i + batch_size] for i in range(0, len(paths), batch_size))
+  # consume the results so that exceptions in workers are raised here
+  for _ in _get_clang_format_executor().map(
+      lambda batch: clang_format_many(batch, *args), batches):
+    pass
+
+
 def get_instance_name(item: Tuple[str, int]) -> str:
-  return '_'.join(map(str, item))
+  # item may be a list if it comes from json
+  return _get_instance_name(*item)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_instance_name(task_name: str, instance_id: int) -> str:
+  return sys.intern(f'{task_name}_{instance_id}')
 
 
 def get_module_name(module: str) -> str:
   return f'{module}'
 
 
-def parse_connectivity(vitis_config_ini: TextIO) -> Dict[str, str]:
-  """parse the .ini config file.
+# maps BLAKE2b digests of .ini contents to parsed connectivity
+_connectivity_cache: Dict[bytes, Mapping[str, str]] = {}
+
+
+def parse_connectivity(
+    vitis_config_ini: Union[str, TextIO, BinaryIO]) -> Mapping[str, str]:
+  """parse the .ini config file, given as a path or a file object.
 
     Example:
     [connectivity]
@@ -47,84 +124,175 @@ def parse_connectivity(vitis_config_ini: TextIO) -> Dict[str, str]:
 
     Output:
     {'edge_list_ch0': 'HBM[0]'}
+
+    Results are cached by the content of the file and returned as read-only
+    mappings, so parsing the same file repeatedly is cheap.
   """
   if vitis_config_ini is None:
     return {}
+  return _read_connectivity(vitis_config_ini)[1]
+
 
-  class MultiDict(dict):
+def _read_connectivity(
+    vitis_config_ini: Union[str, TextIO, BinaryIO]
+) -> Tuple[bytes, Mapping[str, str]]:
+  """Returns the digest of the .ini file and the parsed connectivity."""
+  # read the whole file at once; bytes are decoded only on cache misses
+  if isinstance(vitis_config_ini, str):
+    with open(vitis_config_ini, 'rb') as fp:
+      config_ini = fp.read()
+  else:
+    config_ini = vitis_config_ini.read()
+  if isinstance(config_ini, str):
+    digest = hashlib.blake2b(config_ini.encode()).digest()
+  else:
+    digest = hashlib.blake2b(config_ini).digest()
+  arg_name_to_external_port = _connectivity_cache.get(digest)
+  if arg_name_to_external_port is None:
+    if isinstance(config_ini, bytes):
+      config_ini = config_ini.decode()
+    arg_name_to_external_port = types.MappingProxyType(
+        _parse_connectivity(config_ini))
+    _connectivity_cache[digest] = arg_name_to_external_port
+  return digest, arg_name_to_external_port
+
+
+# matches `sp` values, e.g., `serpens_1.edge_list_ch0:HBM[0]`
+_SP_VALUE_RE = re.compile(r'([^.\s]+)\.([^:]+):(.+)')
 
-    def __setitem__(self, key, value):
-      if isinstance(value, list) and key in self:
-        self[key].extend(value)
-      else:
-        super().__setitem__(key, value)
 
-  config = configparser.RawConfigParser(dict_type=MultiDict, strict=False)
-  config.read_file(vitis_config_ini)
+def _parse_connectivity(config_ini: str) -> Dict[str, str]:
+  """Parse `sp` options in the `[connectivity]` section(s) of a .ini file.
 
+  This follows the syntax accepted by configparser.RawConfigParser: options
+  may be delimited by `=` or `:`, option names are case-insensitive, and
+  lines indented deeper than an option continue its value.
+  """
   arg_name_to_external_port = {}
-  for connectivity in config['connectivity']['sp'].splitlines():
-    if not connectivity:
+  in_connectivity = False
+  option = None  # name of the option that may have continuation lines
+  option_indent = 0
+  for line in config_ini.splitlines():
+    value = line.strip()
+    if not value or value[0] in '#;':
+      continue
+    indent = len(line) - len(line.lstrip())
+    if option is not None and indent > option_indent:
+      pass  # continuation of a multi-line value
+    elif value[0] == '[':
+      in_connectivity = value[1:value.rfind(']')] == 'connectivity'
+      option = None
+      continue
+    elif not in_connectivity:
+      # options in other sections are irrelevant; only track continuations
+      option, option_indent = '', indent
+      continue
+    else:
+      option, value = _split_option(value)
+      option_indent = indent
+    if not in_connectivity or option != 'sp' or not value:
       continue
 
-    dot = connectivity.find('.')
-    colon = connectivity.find(':')
-    kernel = connectivity[:dot]
-    kernel_arg = connectivity[dot + 1:colon]
-    port = connectivity[colon + 1:]
+    match = _SP_VALUE_RE.match(value)
+    if match is None:
+      _logger.warning('ignoring malformed connectivity: %s', value)
+      continue
+    kernel, kernel_arg, port = match.group(1, 2, 3)
 
     arg_name_to_external_port[kernel_arg] = port
 
   return arg_name_to_external_port
 
+
+def _split_option(line: str) -> Tuple[str, str]:
+  """Split an .ini line into lower-cased option name and value."""
+  eq = line.find('=')
+  colon = line.find(':')
+  if eq == -1 or colon != -1 and colon < eq:
+    eq = colon
+  if eq == -1:
+    return line.lower(), ''
+  return line[:eq].rstrip().lower(), line[eq + 1:].lstrip()
+
+
+# maps top-level tasks to digests of .ini contents known to bind all mmaps
+_validated_connectivity: 'weakref.WeakKeyDictionary[Task, Set[bytes]]' = (
+    weakref.WeakKeyDictionary())
+
+
 def parse_connectivity_and_check_completeness(
-    vitis_config_ini: TextIO,
+    vitis_config_ini: Union[str, TextIO, BinaryIO],
     top_task: Task,
-) -> Dict[str, str]:
-  arg_name_to_external_port = parse_connectivity(vitis_config_ini)
+) -> Mapping[str, str]:
+  if vitis_config_ini is None:
+    digest, arg_name_to_external_port = None, {}
+  else:
+    digest, arg_name_to_external_port = _read_connectivity(vitis_config_ini)
+    validated_digests = _validated_connectivity.setdefault(top_task, set())
+    if digest in validated_digests:
+      return arg_name_to_external_port
 
   # check that every MMAP/ASYNC_MMAP port has a physical mapping
   for arg_list in top_task.args.values():
     for arg in arg_list:
-      if arg.cat in {Instance.Arg.Cat.ASYNC_MMAP, Instance.Arg.Cat.MMAP}:
+      if arg.cat & Instance.Arg.Cat.MMAP:
         if arg.name not in arg_name_to_external_port:
           raise AssertionError(f'Missing physical binding for {arg.name} in {vitis_config_ini}')
 
+  if digest is not None:
+    validated_digests.add(digest)
   return arg_name_to_external_port
 
+
 def parse_port(port: str) -> Tuple[str, int]:
-  bra = port.find('[')
-  ket = port.find(']')
-  colon = port.find(':')
-  if colon != -1:
-    ket = colon  # use the first channel if a range is specified
-  port_cat = port[:bra]
-  port_id = int(port[bra + 1:ket])
-  return port_cat, port_id
+  port_cat, _, port_id = port.partition('[')
+  port_id = port_id.partition(']')[0]
+  port_id = port_id.partition(':')[0]  # use the first channel of a range
+  return port_cat, int(port_id)
+
 
+# (part number prefix, max addr width) pairs
+_PART_ADDR_WIDTHS = (
+    ('xcu280', 35),  # 8GB of HBM capacity or 32 GB of DDR capacity
+    ('xcu250', 36),  # 64GB of DDR capacity
+)
+
+
+@functools.lru_cache(maxsize=16)
 def get_max_addr_width(part_num: str) -> int:
   """ get the max addr width based on the memory capacity """
-  if part_num.startswith('xcu280'):
-    addr_width = 35  # 8GB of HBM capacity or 32 GB of DDR capacity
-  elif part_num.startswith('xcu250'):
-    addr_width = 36  # 64GB of DDR capacity
-  else:
-    addr_width = 64
-
-  return addr_width
+  for prefix, addr_width in _PART_ADDR_WIDTHS:
+    if part_num.startswith(prefix):
+      return addr_width
+  return 64
 
 
 def get_vendor_include_paths() -> Iterator[str]:
-  """Yields include paths that are automatically available in vendor tools."""
-  try:
-    for line in subprocess.check_output(
-        ['frt_get_xlnx_env'],
-        universal_newlines=True,
-    ).split('\0'):
-      if not line:
-        continue
-      key, value = line.split('=', maxsplit=1)
-      if key == 'XILINX_HLS':
-        yield os.path.join(value, 'include')
-  except FileNotFoundError:
+  """Yields include paths that are automatically available in vendor tools.
+
+  The paths are fetched only once per process; set `TAPA_SKIP_VENDOR_CACHE=1`
+  to fetch them again, e.g., if the vendor tool environment has changed.
+  """
+  if os.environ.get('TAPA_SKIP_VENDOR_CACHE') == '1':
+    _fetch_vendor_include_paths.cache_clear()
+  yield from _fetch_vendor_include_paths()
+
+
+@functools.lru_cache(maxsize=1)
+def _fetch_vendor_include_paths() -> Tuple[str, ...]:
+  frt_get_xlnx_env = shutil.which('frt_get_xlnx_env')
+  if frt_get_xlnx_env is None:
     _logger.warn('not adding vendor include paths; please update FRT')
+    return ()
+  include_paths = []
+  for line in subprocess.check_output(
+      [frt_get_xlnx_env],
+      universal_newlines=True,
+      close_fds=False,
+  ).split('\0'):
+    if not line:
+      continue
+    key, value = line.split('=', maxsplit=1)
+    if key == 'XILINX_HLS':
+      include_paths.append(os.path.join(value, 'include'))
+  return tuple(include_paths)
@@ -141,7 +141,7 @@ def print_kernel_xml(name: str, ports: Iterable[tapa.instance.Port],
     elif port.cat == tapa.instance.Instance.Arg.Cat.OSTREAM:
       cat = backend.Cat.OSTREAM
     else:
-      raise ValueError(f'unexpected port.cat: {port.cat}')
+      raise ValueError(f'unexpected port.cat: {port.cat!r}')
 
     args.append(
         backend.Arg(